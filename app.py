@@ -6,35 +6,185 @@ Flask backend with MediaPipe pose detection, SQLite storage, and secure authenti
 import os
 import sqlite3
 import base64
+import hmac
 import math
 import secrets
+import threading
+import queue
 import numpy as np
-import json
+import orjson
 import cv2
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from functools import wraps
 from flask import (
     Flask, render_template, request, redirect,
-    url_for, session, flash, jsonify, g
+    url_for, session, flash, jsonify, g, Response
 )
-from werkzeug.security import generate_password_hash, check_password_hash
+from flask.json.provider import JSONProvider
+from werkzeug.security import check_password_hash
+from argon2 import PasswordHasher
+from argon2.exceptions import VerifyMismatchError
+from numba import njit
 import mediapipe as mp
 
+# libjpeg-turbo decodes the browser's JPEG frames much faster than
+# cv2.imdecode and can downscale during the DCT pass; fall back to OpenCV
+# when the shared library is unavailable or the payload is not a JPEG.
+try:
+    from turbojpeg import TurboJPEG, TJPF_RGB
+    _TJ = TurboJPEG()
+except (ImportError, OSError):
+    _TJ = None
+
 # ─── App Configuration ──────────────────────────────────────────────────────
+class ORJSONProvider(JSONProvider):
+    """orjson-backed codec for Flask; also serializes numpy values natively."""
+
+    def dumps(self, obj, **kwargs) -> str:
+        return orjson.dumps(obj, option=orjson.OPT_SERIALIZE_NUMPY).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+
 app = Flask(__name__)
+app.json = ORJSONProvider(app)
 app.secret_key = os.environ.get("SECRET_KEY", secrets.token_hex(32))
 DATABASE = os.path.join(os.path.dirname(__file__), "database", "app.db")
 
 # ─── MediaPipe Setup ─────────────────────────────────────────────────────────
 mp_pose = mp.solutions.pose
-pose_detector = mp_pose.Pose(
-    static_image_mode=False,
-    model_complexity=1,
-    enable_segmentation=False,
-    min_detection_confidence=0.5,
-    min_tracking_confidence=0.5,
+
+
+def _make_pose():
+    return mp_pose.Pose(
+        static_image_mode=False,
+        model_complexity=1,
+        enable_segmentation=False,
+        min_detection_confidence=0.5,
+        min_tracking_confidence=0.5,
+    )
+
+
+# Pose.process is not thread-safe; a small pool of detectors lets concurrent
+# requests run in parallel instead of serializing on one shared graph.
+_POSE_POOL_SIZE = max(1, (os.cpu_count() or 2) // 2)
+_POSE_POOL: queue.Queue = queue.Queue()
+_pose_pool_ready = False
+_pose_pool_lock = threading.Lock()
+
+
+def init_pose_pool():
+    """Build and warm the detector pool in the serving process.
+
+    Each detector is warmed with a blank frame so the lazy TFLite graph
+    build never lands on a live request. This must run post-fork — the
+    graphs own C++ scheduler threads that fork() does not preserve — so
+    gunicorn calls it from a post_fork hook (see gunicorn.conf.py) and
+    analyze_posture falls back to calling it on first use.
+    """
+    global _pose_pool_ready
+    with _pose_pool_lock:
+        if _pose_pool_ready:
+            return
+        warm_frame = np.zeros((480, 640, 3), dtype=np.uint8)
+        for _ in range(_POSE_POOL_SIZE):
+            detector = _make_pose()
+            detector.process(warm_frame)
+            _POSE_POOL.put(detector)
+        _pose_pool_ready = True
+
+# Decodes several frames of a batch request in parallel; sized to the pose
+# pool since detection is the bottleneck.
+_BATCH_POOL = ThreadPoolExecutor(
+    max_workers=_POSE_POOL_SIZE, thread_name_prefix="batch"
+)
+_BATCH_MAX_FRAMES = 16
+
+# Visibility-weighted landmark set for the confidence metric, resolved once at
+# import so analyze_posture pays no per-frame enum lookups.
+_CONF_IDX = np.array(
+    [
+        mp_pose.PoseLandmark.LEFT_SHOULDER.value,
+        mp_pose.PoseLandmark.RIGHT_SHOULDER.value,
+        mp_pose.PoseLandmark.LEFT_HIP.value,
+        mp_pose.PoseLandmark.RIGHT_HIP.value,
+        mp_pose.PoseLandmark.LEFT_EAR.value,
+        mp_pose.PoseLandmark.RIGHT_EAR.value,
+        mp_pose.PoseLandmark.NOSE.value,
+    ],
+    dtype=np.intp,
+)
+_CONF_WEIGHTS = np.array([2, 2, 2, 2, 1, 1, 1], dtype=np.float32)
+_CONF_WEIGHT_TOTAL = float(_CONF_WEIGHTS.sum())
+
+# Gather order for the angle kernel: left/right shoulder, left/right hip,
+# left/right ear — resolved from the PoseLandmark enum once at import.
+_ANGLE_IDX = np.array(
+    [
+        mp_pose.PoseLandmark.LEFT_SHOULDER.value,
+        mp_pose.PoseLandmark.RIGHT_SHOULDER.value,
+        mp_pose.PoseLandmark.LEFT_HIP.value,
+        mp_pose.PoseLandmark.RIGHT_HIP.value,
+        mp_pose.PoseLandmark.LEFT_EAR.value,
+        mp_pose.PoseLandmark.RIGHT_EAR.value,
+    ],
+    dtype=np.intp,
+)
+
+# Scoring tables, in kernel output order (shoulder, neck, head tilt, spine):
+# np.searchsorted against the thresholds picks the (penalty, feedback) bucket
+# for each angle without interpreter branching.
+_SCORE_RULES = (
+    (
+        np.array([5.0, 12.0]),
+        np.array([0, 10, 25]),
+        (
+            "",
+            "Slight shoulder imbalance — try to level both shoulders.",
+            "Uneven shoulders detected — check your seating and straighten up.",
+        ),
+    ),
+    (
+        np.array([10.0, 20.0]),
+        np.array([0, 15, 30]),
+        (
+            "",
+            "Mild forward head posture — draw your head back slightly.",
+            "Significant forward neck tilt — align your ears directly over your shoulders.",
+        ),
+    ),
+    (
+        np.array([5.0, 10.0]),
+        np.array([0, 5, 15]),
+        (
+            "",
+            "Slight head tilt — keep your head level for a confident look.",
+            "Noticeable head tilt — straighten your head position.",
+        ),
+    ),
+    (
+        np.array([8.0, 15.0]),
+        np.array([0, 10, 25]),
+        (
+            "",
+            "Mild slouching — sit up straight and engage your core.",
+            "Significant slouching detected — sit tall with your back against the chair.",
+        ),
+    ),
 )
 
+_STATUS_TH = np.array([45, 65, 85])
+_STATUSES = ("Poor", "Needs Improvement", "Good", "Excellent")
+
+# Per-thread scratch for the (6, 2) landmark buffer fed to compute_all_angles,
+# so the hot path reuses one allocation per worker thread instead of a fresh
+# fancy-index copy per frame.
+_SCRATCH = threading.local()
+
+
 # ─── Database ────────────────────────────────────────────────────────────────
 def get_db():
     db = getattr(g, "_database", None)
@@ -57,6 +207,8 @@ def init_db():
     os.makedirs(os.path.dirname(DATABASE), exist_ok=True)
     with app.app_context():
         db = get_db()
+        db.execute("PRAGMA journal_mode=WAL")
+        db.execute("PRAGMA synchronous=NORMAL")
         db.executescript(
             """
             CREATE TABLE IF NOT EXISTS users (
@@ -81,11 +233,92 @@ def init_db():
                 created_at     TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
                 FOREIGN KEY (user_id) REFERENCES users(id)
             );
+
+            CREATE INDEX IF NOT EXISTS idx_posture_user
+                ON posture_records(user_id, created_at DESC);
             """
         )
         db.commit()
 
 
+# ─── Background Record Writer ─────────────────────────────────────────────────
+# detect_posture enqueues rows and returns immediately; one daemon thread
+# drains the queue in batches so fsync + transaction setup is amortized
+# across inserts instead of paid once per POST.
+_WRITE_Q: queue.Queue = queue.Queue()
+
+_INSERT_RECORD_SQL = """
+    INSERT INTO posture_records
+        (user_id, shoulder_angle, neck_angle, head_tilt, spine_angle,
+         posture_score, posture_status, feedback, confidence)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+
+def _record_writer():
+    os.makedirs(os.path.dirname(DATABASE), exist_ok=True)
+    db = sqlite3.connect(DATABASE)
+    db.execute("PRAGMA journal_mode=WAL")
+    db.execute("PRAGMA synchronous=NORMAL")
+    while True:
+        batch = [_WRITE_Q.get()]
+        while len(batch) < 64:
+            try:
+                batch.append(_WRITE_Q.get_nowait())
+            except queue.Empty:
+                break
+        try:
+            db.executemany(_INSERT_RECORD_SQL, batch)
+            db.commit()
+        except sqlite3.Error as exc:
+            db.rollback()
+            print(f"[record_writer] Error: {exc}")
+
+
+_writer_started = False
+_writer_lock = threading.Lock()
+
+
+def _enqueue_record(row: tuple) -> None:
+    """Queue a posture_records row, starting the writer thread on first use.
+
+    The thread must not start at import: under gunicorn --preload, fork()
+    preserves only the calling thread, leaving every worker with a queue
+    nobody drains. Lazy start puts it in whichever process serves requests.
+    """
+    global _writer_started
+    if not _writer_started:
+        with _writer_lock:
+            if not _writer_started:
+                threading.Thread(
+                    target=_record_writer, daemon=True, name="record-writer"
+                ).start()
+                _writer_started = True
+    _WRITE_Q.put(row)
+
+
+# ─── Password Hashing ─────────────────────────────────────────────────────────
+# Argon2's native core is far cheaper per unit of security than werkzeug's
+# Python-looped PBKDF2, and the bounded executor caps concurrent hashing so
+# a burst of logins cannot peg every request thread at once.
+_PH = PasswordHasher(time_cost=2, memory_cost=65536, parallelism=2)
+_HASH_POOL = ThreadPoolExecutor(max_workers=2, thread_name_prefix="pwhash")
+
+
+def hash_password(password: str) -> str:
+    return _HASH_POOL.submit(_PH.hash, password).result()
+
+
+def verify_password(stored_hash: str, password: str) -> bool:
+    if not stored_hash.startswith("$argon2"):
+        # Legacy werkzeug (PBKDF2) hash from before the argon2 switch.
+        return check_password_hash(stored_hash, password)
+    try:
+        return _HASH_POOL.submit(_PH.verify, stored_hash, password).result()
+    except VerifyMismatchError:
+        return False
+
+
 # ─── Auth Helpers ─────────────────────────────────────────────────────────────
 def login_required(f):
     @wraps(f)
@@ -99,7 +332,7 @@ def login_required(f):
 
 def generate_csrf_token():
     if "csrf_token" not in session:
-        session["csrf_token"] = secrets.token_hex(32)
+        session["csrf_token"] = secrets.token_urlsafe(24)
     return session["csrf_token"]
 
 
@@ -107,40 +340,76 @@ app.jinja_env.globals["csrf_token"] = generate_csrf_token
 
 
 def validate_csrf(token):
-    return token and token == session.get("csrf_token")
+    # Compare as bytes: compare_digest raises TypeError on non-ASCII str
+    # input, and the submitted token is attacker-controlled.
+    return bool(token) and hmac.compare_digest(
+        token.encode("utf-8"), session.get("csrf_token", "").encode("utf-8")
+    )
 
 
 # ─── Rate Limiting (in-memory) ────────────────────────────────────────────────
-_rate_store: dict = {}
+_rate_store: dict[int, deque] = {}
+_rate_lock = threading.Lock()
 
 
 def check_rate_limit(user_id: int, limit: int = 10, window: int = 60) -> bool:
+    """O(1) sliding-window admission: a deque of timestamps per user, where
+    only the oldest entry decides whether a full window has room again."""
     now = datetime.now().timestamp()
-    if user_id not in _rate_store:
-        _rate_store[user_id] = []
-    _rate_store[user_id] = [t for t in _rate_store[user_id] if now - t < window]
-    if len(_rate_store[user_id]) >= limit:
-        return False
-    _rate_store[user_id].append(now)
+    with _rate_lock:
+        dq = _rate_store.setdefault(user_id, deque())
+        if len(dq) >= limit:
+            if now - dq[0] < window:
+                return False
+            dq.popleft()
+        dq.append(now)
     return True
 
 
 # ─── Posture Analysis Engine ──────────────────────────────────────────────────
-def _angle_from_vertical(p1: list, p2: list) -> float:
-    """Angle of the vector p1→p2 from the vertical axis, in degrees."""
-    dx = p2[0] - p1[0]
-    dy = p2[1] - p1[1]
-    return abs(math.degrees(math.atan2(dx, -dy)))
+@njit(cache=True, fastmath=True)
+def compute_all_angles(pts: np.ndarray) -> tuple:
+    """
+    Fused native kernel for all four posture angles, in degrees.
+
+    `pts` is a (6, 2) float32 array of pixel coordinates in the order:
+    left/right shoulder, left/right hip, left/right ear. Returns
+    (shoulder_angle, neck_angle, head_tilt, spine_angle).
+    """
+    rad2deg = 180.0 / math.pi
+
+    mid_shoulder_x = (pts[0, 0] + pts[1, 0]) * 0.5
+    mid_shoulder_y = (pts[0, 1] + pts[1, 1]) * 0.5
+    mid_hip_x      = (pts[2, 0] + pts[3, 0]) * 0.5
+    mid_hip_y      = (pts[2, 1] + pts[3, 1]) * 0.5
+    mid_ear_x      = (pts[4, 0] + pts[5, 0]) * 0.5
+    mid_ear_y      = (pts[4, 1] + pts[5, 1]) * 0.5
+
+    # 1. Shoulder slope (deviation from horizontal)
+    shoulder = abs(math.atan2(pts[1, 1] - pts[0, 1], pts[1, 0] - pts[0, 0])) * rad2deg
+    if shoulder > 90.0:
+        shoulder = 180.0 - shoulder
+
+    # 2. Neck / forward head posture (mid-shoulder → mid-ear from vertical)
+    neck = abs(
+        math.atan2(mid_ear_x - mid_shoulder_x, -(mid_ear_y - mid_shoulder_y))
+    ) * rad2deg
+
+    # 3. Head tilt left/right (ear slope)
+    head = abs(math.atan2(pts[5, 1] - pts[4, 1], pts[5, 0] - pts[4, 0])) * rad2deg
+    if head > 90.0:
+        head = 180.0 - head
 
+    # 4. Spine angle from vertical (mid-hip → mid-shoulder)
+    spine = abs(
+        math.atan2(mid_shoulder_x - mid_hip_x, -(mid_shoulder_y - mid_hip_y))
+    ) * rad2deg
 
-def _slope_angle(p1: list, p2: list) -> float:
-    """Horizontal slope angle between two points (deviation from flat), degrees."""
-    dx = p2[0] - p1[0]
-    dy = p2[1] - p1[1]
-    angle = abs(math.degrees(math.atan2(dy, dx)))
-    if angle > 90:
-        angle = 180 - angle
-    return angle
+    return shoulder, neck, head, spine
+
+
+# Warm the JIT at import so compilation cost is never paid on a request thread.
+compute_all_angles(np.zeros((6, 2), dtype=np.float32))
 
 
 def analyze_posture(image_b64: str) -> tuple:
@@ -151,21 +420,50 @@ def analyze_posture(image_b64: str) -> tuple:
    
     try:
         # ── Decode image ─────────────────────────────────────────────────────
-        if "," in image_b64:
-            image_b64 = image_b64.split(",", 1)[1]
-        img_bytes = base64.b64decode(image_b64)
-        np_arr = np.frombuffer(img_bytes, np.uint8)
-        img_bgr = cv2.imdecode(np_arr, cv2.IMREAD_COLOR)
-
-        if img_bgr is None:
-            return None, "Could not decode image. Please try again."
-
-        # ── Resize for performance ────────────────────────────────────────────
-        img_bgr = cv2.resize(img_bgr, (640, 480))
-        img_rgb = cv2.cvtColor(img_bgr, cv2.COLOR_BGR2RGB)
+        # Work on bytes: stripping the data-URL prefix becomes one memchr +
+        # slice instead of scanning and copying the whole payload as str.
+        payload = image_b64.encode("ascii")
+        comma = payload.find(b",")
+        if comma >= 0:
+            payload = payload[comma + 1:]
+        img_bytes = base64.b64decode(payload)
+
+        img_rgb = None
+        if _TJ is not None:
+            try:
+                # Decode straight to RGB; halve large frames during the DCT
+                # pass so the resize below starts from far fewer pixels.
+                width = _TJ.decode_header(img_bytes)[0]
+                scale = (1, 2) if width >= 1280 else (1, 1)
+                img_rgb = _TJ.decode(
+                    img_bytes, pixel_format=TJPF_RGB, scaling_factor=scale
+                )
+            except Exception:
+                img_rgb = None  # not a JPEG (e.g. PNG upload) — use OpenCV
+
+        if img_rgb is None:
+            np_arr = np.frombuffer(img_bytes, np.uint8)
+            img_bgr = cv2.imdecode(np_arr, cv2.IMREAD_COLOR)
+            if img_bgr is None:
+                return None, "Could not decode image. Please try again."
+            # MediaPipe needs a contiguous buffer, so a reversed-stride numpy
+            # view is out; swap the channels in place instead of allocating a
+            # second full-frame copy.
+            cv2.cvtColor(img_bgr, cv2.COLOR_BGR2RGB, dst=img_bgr)
+            img_rgb = img_bgr
+
+        # ── Resize for performance (skip when the frame is already sized) ─────
+        if img_rgb.shape[1] != 640 or img_rgb.shape[0] != 480:
+            img_rgb = cv2.resize(img_rgb, (640, 480), interpolation=cv2.INTER_AREA)
 
         # ── Run pose detection ────────────────────────────────────────────────
-        results = pose_detector.process(img_rgb)
+        if not _pose_pool_ready:
+            init_pose_pool()
+        detector = _POSE_POOL.get()
+        try:
+            results = detector.process(img_rgb)
+        finally:
+            _POSE_POOL.put(detector)
         if not results.pose_landmarks:
             return None, (
                 "No person detected. Please ensure your full upper body is "
@@ -173,61 +471,27 @@ def analyze_posture(image_b64: str) -> tuple:
             )
 
         lm = results.pose_landmarks.landmark
-        h, w = img_bgr.shape[:2]
-
-        def pt(idx: int) -> list:
-            p = lm[idx]
-            return [p.x * w, p.y * h]
+        h, w = img_rgb.shape[:2]
 
         # ── Extract key landmarks ─────────────────────────────────────────────
-        nose          = pt(mp_pose.PoseLandmark.NOSE.value)
-        left_ear      = pt(mp_pose.PoseLandmark.LEFT_EAR.value)
-        right_ear     = pt(mp_pose.PoseLandmark.RIGHT_EAR.value)
-        left_shoulder = pt(mp_pose.PoseLandmark.LEFT_SHOULDER.value)
-        right_shoulder= pt(mp_pose.PoseLandmark.RIGHT_SHOULDER.value)
-        left_hip      = pt(mp_pose.PoseLandmark.LEFT_HIP.value)
-        right_hip     = pt(mp_pose.PoseLandmark.RIGHT_HIP.value)
-
-        mid_shoulder = [
-            (left_shoulder[0] + right_shoulder[0]) / 2,
-            (left_shoulder[1] + right_shoulder[1]) / 2,
-        ]
-        mid_hip = [
-            (left_hip[0] + right_hip[0]) / 2,
-            (left_hip[1] + right_hip[1]) / 2,
-        ]
-        mid_ear = [
-            (left_ear[0] + right_ear[0]) / 2,
-            (left_ear[1] + right_ear[1]) / 2,
-        ]
+        # One (33, 4) array of (x, y, z, visibility), scaled to pixels in bulk.
+        lm_arr = np.array(
+            [[p.x, p.y, p.z, p.visibility] for p in lm], dtype=np.float32
+        )
+        lm_arr[:, 0] *= w
+        lm_arr[:, 1] *= h
+        xy = lm_arr[:, :2]
 
         # ── Compute angles ────────────────────────────────────────────────────
-        # 1. Shoulder slope (deviation from horizontal)
-        shoulder_angle = _slope_angle(left_shoulder, right_shoulder)
-
-        # 2. Neck / forward head posture (mid-ear to mid-shoulder from vertical)
-        neck_angle = _angle_from_vertical(mid_shoulder, mid_ear)
-
-        # 3. Head tilt left/right (ear slope)
-        head_tilt = _slope_angle(left_ear, right_ear)
-
-        # 4. Spine angle from vertical (mid-hip to mid-shoulder)
-        spine_angle = _angle_from_vertical(mid_hip, mid_shoulder)
+        pts = getattr(_SCRATCH, "pts", None)
+        if pts is None:
+            pts = _SCRATCH.pts = np.empty((6, 2), dtype=np.float32)
+        np.take(xy, _ANGLE_IDX, axis=0, out=pts)
+        shoulder_angle, neck_angle, head_tilt, spine_angle = compute_all_angles(pts)
 
         # ── Confidence ────────────────────────────────────────────────────────
-        weights = {
-            mp_pose.PoseLandmark.LEFT_SHOULDER.value: 2,
-            mp_pose.PoseLandmark.RIGHT_SHOULDER.value: 2,
-            mp_pose.PoseLandmark.LEFT_HIP.value: 2,
-            mp_pose.PoseLandmark.RIGHT_HIP.value: 2,
-            mp_pose.PoseLandmark.LEFT_EAR.value: 1,
-            mp_pose.PoseLandmark.RIGHT_EAR.value: 1,
-            mp_pose.PoseLandmark.NOSE.value: 1,}
-
-        total_weight = sum(weights.values())
-        weighted_sum = sum(lm[i].visibility * weights[i] for i in weights)
-
-        confidence = round((weighted_sum / total_weight) * 100, 1)
+        weighted_sum = float(np.dot(lm_arr[_CONF_IDX, 3], _CONF_WEIGHTS))
+        confidence = round((weighted_sum / _CONF_WEIGHT_TOTAL) * 100, 1)
         # ── Scoring ───────────────────────────────────────────────────────────
         score = 100
         feedback: list[str] = []
@@ -236,61 +500,16 @@ def analyze_posture(image_b64: str) -> tuple:
             score -= 25
             feedback.append("Low detection confidence — ensure full upper body is visible.")
 
-
-        # Shoulder levelness
-        if shoulder_angle < 5:
-            pass
-        elif shoulder_angle < 12:
-            score -= 10
-            feedback.append("Slight shoulder imbalance — try to level both shoulders.")
-        else:
-            score -= 25
-            feedback.append("Uneven shoulders detected — check your seating and straighten up.")
-
-        # Neck forward tilt
-        if neck_angle < 10:
-            pass
-        elif neck_angle < 20:
-            score -= 15
-            feedback.append("Mild forward head posture — draw your head back slightly.")
-        else:
-            score -= 30
-            feedback.append(
-                "Significant forward neck tilt — align your ears directly over your shoulders."
-            )
-
-        # Head tilt
-        if head_tilt < 5:
-            pass
-        elif head_tilt < 10:
-            score -= 5
-            feedback.append("Slight head tilt — keep your head level for a confident look.")
-        else:
-            score -= 15
-            feedback.append("Noticeable head tilt — straighten your head position.")
-
-        # Spine / back straightness
-        if spine_angle < 8:
-            pass
-        elif spine_angle < 15:
-            score -= 10
-            feedback.append("Mild slouching — sit up straight and engage your core.")
-        else:
-            score -= 25
-            feedback.append(
-                "Significant slouching detected — sit tall with your back against the chair."
-            )
+        angles = (shoulder_angle, neck_angle, head_tilt, spine_angle)
+        for value, (thresholds, penalties, messages) in zip(angles, _SCORE_RULES):
+            bucket = int(np.searchsorted(thresholds, value, side="right"))
+            score -= int(penalties[bucket])
+            if messages[bucket]:
+                feedback.append(messages[bucket])
 
         score = max(0, min(100, score))
 
-        if score >= 85:
-            status = "Excellent"
-        elif score >= 65:
-            status = "Good"
-        elif score >= 45:
-            status = "Needs Improvement"
-        else:
-            status = "Poor"
+        status = _STATUSES[int(np.searchsorted(_STATUS_TH, score, side="right"))]
 
         if not feedback:
             feedback.append(
@@ -350,7 +569,7 @@ def register():
         try:
             db.execute(
                 "INSERT INTO users (username, email, password_hash) VALUES (?, ?, ?)",
-                (username, email, generate_password_hash(password)),
+                (username, email, hash_password(password)),
             )
             db.commit()
             flash("Account created! Please log in.", "success")
@@ -379,7 +598,7 @@ def login():
             "SELECT * FROM users WHERE username = ?", (username,)
         ).fetchone()
 
-        if user and check_password_hash(user["password_hash"], password):
+        if user and verify_password(user["password_hash"], password):
             session.clear()
             session["user_id"]  = user["id"]
             session["username"] = user["username"]
@@ -404,23 +623,33 @@ def dashboard():
     db      = get_db()
     user_id = session["user_id"]
 
+    # Aggregates in SQLite; no need to materialize the full history.
+    total_sessions, avg_score = db.execute(
+        "SELECT COUNT(*), AVG(posture_score) FROM posture_records WHERE user_id = ?",
+        (user_id,),
+    ).fetchone()
+    avg_score = round(avg_score, 1) if avg_score is not None else 0
+
     records = db.execute(
-        "SELECT * FROM posture_records WHERE user_id = ? ORDER BY created_at DESC",
+        """
+        SELECT id, shoulder_angle, neck_angle, head_tilt, spine_angle,
+               posture_score, posture_status, feedback, confidence, created_at
+        FROM posture_records WHERE user_id = ?
+        ORDER BY created_at DESC LIMIT 500
+        """,
         (user_id,),
     ).fetchall()
-
-    total_sessions = len(records)
-    avg_score = (
-        round(sum(r["posture_score"] for r in records) / total_sessions, 1)
-        if records else 0
-    )
     latest = records[0] if records else None
 
     # Improvement from first to latest session
     improvement = 0
-    if len(records) >= 2:
-        first_score = records[-1]["posture_score"]
-        last_score  = records[0]["posture_score"]
+    if total_sessions >= 2:
+        first_score = db.execute(
+            "SELECT posture_score FROM posture_records WHERE user_id = ? "
+            "ORDER BY created_at ASC LIMIT 1",
+            (user_id,),
+        ).fetchone()[0]
+        last_score = records[0]["posture_score"]
         if first_score > 0:
             improvement = round(((last_score - first_score) / first_score) * 100, 1)
 
@@ -437,7 +666,7 @@ def dashboard():
         improvement=improvement,
         chart_labels=chart_labels,
         chart_scores=chart_scores,
-        records=records[:500],
+        records=records,
     )
 
 
@@ -464,15 +693,8 @@ def detect_posture():
         if error:
             return jsonify({"error": error}), 400
 
-        # Persist record
-        db = get_db()
-        db.execute(
-            """
-            INSERT INTO posture_records
-                (user_id, shoulder_angle, neck_angle, head_tilt, spine_angle,
-                 posture_score, posture_status, feedback, confidence)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """,
+        # Persist record via the background writer
+        _enqueue_record(
             (
                 user_id,
                 result["shoulder_angle"],
@@ -483,9 +705,8 @@ def detect_posture():
                 result["posture_status"],
                 "; ".join(result["feedback"]),
                 result["confidence"],
-            ),
+            )
         )
-        db.commit()
 
         return jsonify(result), 200
 
@@ -493,46 +714,97 @@ def detect_posture():
         print(f"[detect_posture] Error: {exc}")
         return jsonify({"error": "Internal server error."}), 500
 
-# ─── Downloadable Report Route ────────────────────────────────────────────────
-@app.route("/report/<int:record_id>")
+@app.route("/detect_posture_batch", methods=["POST"])
 @login_required
-def download_report(record_id):
-    """Generate a plain-text posture report for a specific session."""
-    db   = get_db()
+def detect_posture_batch():
+    """
+    Analyse up to _BATCH_MAX_FRAMES frames in one request, so mock sessions
+    pay routing, rate limiting, and persistence once instead of per frame.
+    """
     user_id = session["user_id"]
 
-    record = db.execute(
-        "SELECT * FROM posture_records WHERE id = ? AND user_id = ?",
-        (record_id, user_id)
-    ).fetchone()
+    if not check_rate_limit(user_id):
+        return jsonify({"error": "Rate limit exceeded. Please wait a moment."}), 429
 
-    if not record:
-        return "Report not found.", 404
+    try:
+        data = request.get_json(silent=True)
+        frames = data.get("images") if data else None
+        if not frames or not isinstance(frames, list):
+            return jsonify({"error": "No image data provided."}), 400
+        if len(frames) > _BATCH_MAX_FRAMES:
+            return jsonify(
+                {"error": f"At most {_BATCH_MAX_FRAMES} frames per request."}
+            ), 400
+
+        outcomes = list(_BATCH_POOL.map(analyze_posture, frames))
+
+        results = []
+        scores  = []
+        for result, error in outcomes:
+            if error:
+                results.append({"error": error})
+                continue
+            results.append(result)
+            scores.append(result["posture_score"])
+            _enqueue_record(
+                (
+                    user_id,
+                    result["shoulder_angle"],
+                    result["neck_angle"],
+                    result["head_tilt"],
+                    result["spine_angle"],
+                    result["posture_score"],
+                    result["posture_status"],
+                    "; ".join(result["feedback"]),
+                    result["confidence"],
+                )
+            )
+
+        if not scores:
+            return jsonify(
+                {"error": "No frames could be analysed.", "results": results}
+            ), 400
+
+        avg_score = round(sum(scores) / len(scores))
+        return jsonify(
+            {
+                "results": results,
+                "avg_score": avg_score,
+                "frames_analysed": len(scores),
+            }
+        ), 200
+
+    except Exception as exc:
+        print(f"[detect_posture_batch] Error: {exc}")
+        return jsonify({"error": "Internal server error."}), 500
 
-    # Build a plain-text report
-    report = f"""
+
+# ─── Downloadable Report Route ────────────────────────────────────────────────
+# Report skeleton built once at import; requests only substitute the fields.
+_REPORT_DATE_FMT = "%Y-%m-%d %H:%M"
+_REPORT_TMPL = """\
 POSTUREIQ — SESSION REPORT
 ===========================
-User       : {session['username']}
-Date       : {record['created_at']}
-Session ID : {record['id']}
+User       : {username}
+Date       : {created_at}
+Session ID : {record_id}
 
 POSTURE SCORE
 ─────────────
-Score      : {record['posture_score']} / 100
-Status     : {record['posture_status']}
-Confidence : {record['confidence']}%
+Score      : {posture_score} / 100
+Status     : {posture_status}
+Confidence : {confidence}%
 
 ANGLE MEASUREMENTS
 ──────────────────
-Shoulder Slope  : {record['shoulder_angle']}°
-Neck Tilt       : {record['neck_angle']}°
-Head Tilt       : {record['head_tilt']}°
-Spine Angle     : {record['spine_angle']}°
+Shoulder Slope  : {shoulder_angle}°
+Neck Tilt       : {neck_angle}°
+Head Tilt       : {head_tilt}°
+Spine Angle     : {spine_angle}°
 
 FEEDBACK
 ────────
-{record['feedback'].replace(';', chr(10))}
+{feedback}
 
 SCORING REFERENCE
 ─────────────────
@@ -541,12 +813,43 @@ SCORING REFERENCE
 45–64   Needs Improvement  One or more significant deviations
 0–44    Poor             Multiple posture issues detected
 
-Generated by PostureIQ · {datetime.now().strftime('%Y-%m-%d %H:%M')}
-"""
+Generated by PostureIQ · {generated_at}"""
+
+
+@app.route("/report/<int:record_id>")
+@login_required
+def download_report(record_id):
+    """Generate a plain-text posture report for a specific session."""
+    db   = get_db()
+    user_id = session["user_id"]
+
+    record = db.execute(
+        "SELECT * FROM posture_records WHERE id = ? AND user_id = ?",
+        (record_id, user_id)
+    ).fetchone()
+
+    if not record:
+        return "Report not found.", 404
+
+    report = _REPORT_TMPL.format_map(
+        {
+            "username":       session["username"],
+            "created_at":     record["created_at"],
+            "record_id":      record["id"],
+            "posture_score":  record["posture_score"],
+            "posture_status": record["posture_status"],
+            "confidence":     record["confidence"],
+            "shoulder_angle": record["shoulder_angle"],
+            "neck_angle":     record["neck_angle"],
+            "head_tilt":      record["head_tilt"],
+            "spine_angle":    record["spine_angle"],
+            "feedback":       record["feedback"].replace(";", "\n"),
+            "generated_at":   datetime.now().strftime(_REPORT_DATE_FMT),
+        }
+    )
 
-    from flask import Response
     return Response(
-        report.strip(),
+        report,
         mimetype="text/plain",
         headers={
             "Content-Disposition": f"attachment; filename=postureiq-report-{record_id}.txt"
@@ -571,12 +874,15 @@ def mock_session():
         if not scores or not isinstance(scores, list):
             return jsonify({"error": "No scores provided."}), 400
 
-        avg_score = round(sum(scores) / len(scores))
+        try:
+            arr = np.asarray(scores, dtype=np.float32)
+        except (TypeError, ValueError):
+            return jsonify({"error": "Invalid scores payload."}), 400
+        if arr.ndim != 1 or arr.size > 10_000:
+            return jsonify({"error": "Invalid scores payload."}), 400
 
-        if avg_score >= 85:   status = "Excellent"
-        elif avg_score >= 65: status = "Good"
-        elif avg_score >= 45: status = "Needs Improvement"
-        else:                 status = "Poor"
+        avg_score = int(round(float(arr.mean())))
+        status = _STATUSES[int(np.searchsorted(_STATUS_TH, avg_score, side="right"))]
 
         db = get_db()
         db.execute(
@@ -603,6 +909,8 @@ def mock_session():
 
 # ─── Entry Point ──────────────────────────────────────────────────────────────
 if __name__ == "__main__":
-    init_db()
+    # Local debugging only — production runs under gunicorn via wsgi.py.
     # Use FLASK_DEBUG=1 environment variable instead of debug=True
+    init_db()
+    init_pose_pool()
     app.run(host="0.0.0.0", port=5000)
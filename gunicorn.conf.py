@@ -0,0 +1,12 @@
+"""
+Gunicorn configuration for PostureIQ.
+
+MediaPipe Pose graphs own C++ scheduler threads that fork() does not
+preserve, so the detector pool must be built in each worker after the
+fork — never in the preloaded master.
+"""
+
+
+def post_fork(server, worker):
+    from app import init_pose_pool
+    init_pose_pool()
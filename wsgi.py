@@ -0,0 +1,18 @@
+"""
+WSGI entry point for production servers.
+
+Run with:
+
+    gunicorn -c gunicorn.conf.py --workers=$(nproc) --threads=4 --preload wsgi:app
+
+--preload imports this module once before forking, so workers share the
+read-only pages (code, numba-compiled kernel, numpy tables) copy-on-write.
+Per-process resources that cannot survive fork() — the MediaPipe detector
+pool and the record-writer thread — are created in each worker instead:
+the pool via the post_fork hook in gunicorn.conf.py, the writer lazily on
+first enqueue.
+"""
+
+from app import app, init_db
+
+init_db()